@@ -14,8 +14,17 @@ import pandas as pd
 # NumPy is used for numerical computations
 import numpy as np
 
-# time module (optional utility)
-import time
+# os is used to check the dataset file's modification time
+import os
+
+# joblib persists the fitted artifacts across cold starts
+import joblib
+
+# ThreadPoolExecutor parallelizes PDF generation for report batches
+from concurrent.futures import ThreadPoolExecutor
+
+# deque keeps the report history bounded to the last N entries
+from collections import deque
 
 # io is used to create in-memory PDF files
 import io
@@ -29,13 +38,8 @@ from sklearn.preprocessing import StandardScaler
 # Logistic Regression is the ML classification model
 from sklearn.linear_model import LogisticRegression
 
-# Matplotlib is used for feature importance plotting
-import matplotlib.pyplot as plt
-
-# ReportLab is used to generate PDF reports
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import green, red, orange, black
+# ReportLab (PDF reports) is imported lazily inside generate_pdf, so
+# the initial page load does not pay for it.
 
 
 # -------------------- PAGE CONFIG --------------------
@@ -51,58 +55,63 @@ st.set_page_config(
 # UI THEME (Custom CSS)
 # ============================================================
 
-# Inject custom CSS for dark medical UI + glass effect
-st.markdown("""
-<style>
-.stApp {
-    background: radial-gradient(circle at top, #0f172a 0%, #020617 65%);
-    color: #e5e7eb;
-}
-.glass {
-    background: rgba(255,255,255,0.06);
-    backdrop-filter: blur(16px);
-    border-radius: 20px;
-    padding: 2rem;
-    box-shadow: 0 20px 50px rgba(0,0,0,0.65);
-}
-</style>
-""", unsafe_allow_html=True)
+# The dark medical theme lives in static/app.css, read once at module
+# load and injected as a <style> block; st.html sanitizes its body and
+# strips <link> tags, so referencing the file as a stylesheet would
+# silently drop the theme
+with open("static/app.css") as css_file:
+    APP_CSS = f"<style>\n{css_file.read()}</style>"
+
+st.html(APP_CSS)
 
 
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 
-# Converts numerical risk percentage into human-readable risk level
+# Risk-band boundaries with matching labels, colours, and advice;
+# searchsorted maps a risk value (scalar or array) to its band in one
+# call, and every band-dependent string lives in these tables
+RISK_BINS = np.array([10.0, 25.0, 50.0, 75.0])
+RISK_LABELS = [
+    "Very Low Risk (Normal)", "Low Risk", "Moderate Risk",
+    "High Risk", "Very High Risk (Critical)"
+]
+RISK_COLORS = ["green", "green", "orange", "red", "red"]
+RISK_ADVICE = [
+    "Maintain a healthy lifestyle. Routine annual checkups recommended.",
+    "Preventive monitoring and a balanced diet are advised.",
+    "Lifestyle modification and periodic cardiology review recommended.",
+    "Medical consultation with a cardiologist is strongly advised.",
+    "Immediate cardiologist consultation required. High clinical risk."
+]
+
+
+# Maps a risk percentage to its band index
+def risk_band(risk):
+    return int(np.searchsorted(RISK_BINS, risk))
+
+
+# Converts numerical risk percentage into human-readable risk level.
+# The colour is returned by name so this stays importable without reportlab.
 def interpret_risk(risk):
-    if risk <= 10:
-        return "Very Low Risk (Normal)", green
-    elif risk <= 25:
-        return "Low Risk", green
-    elif risk <= 50:
-        return "Moderate Risk", orange
-    elif risk <= 75:
-        return "High Risk", red
-    else:
-        return "Very High Risk (Critical)", red
+    band = risk_band(risk)
+    return RISK_LABELS[band], RISK_COLORS[band]
 
 
 # Provides medical-style recommendations based on risk level
 def doctor_recommendation(risk):
-    if risk <= 10:
-        return "Maintain a healthy lifestyle. Routine annual checkups recommended."
-    elif risk <= 25:
-        return "Preventive monitoring and a balanced diet are advised."
-    elif risk <= 50:
-        return "Lifestyle modification and periodic cardiology review recommended."
-    elif risk <= 75:
-        return "Medical consultation with a cardiologist is strongly advised."
-    else:
-        return "Immediate cardiologist consultation required. High clinical risk."
+    return RISK_ADVICE[risk_band(risk)]
 
 
 # Generates a downloadable PDF medical report
 def generate_pdf(report):
+    # Import reportlab here so it only loads when a PDF is requested
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Table, TableStyle
+
     # Create an in-memory buffer to store the PDF
     buffer = io.BytesIO()
 
@@ -130,36 +139,33 @@ def generate_pdf(report):
     c.drawString(50, y, "Patient Clinical Parameters")
     y -= 20
 
-    # Loop through patient data and draw rows
-    c.setFont("Helvetica", 10)
-    for k, v in report["patient_data"].items():
-        c.rect(45, y - 5, 500, 20)
-        c.drawString(60, y, str(k))
-        c.drawString(350, y, str(v))
-        y -= 20
-
-        # Start new page if space runs out
-        if y < 120:
-            c.showPage()
-            y = height - 120
-            c.setFont("Helvetica", 10)
+    # Render patient data as a single Table flowable instead of
+    # per-row rect/drawString calls
+    rows = [[str(k), str(v)] for k, v in report["patient_data"].items()]
+    table = Table(rows, colWidths=[290, 210], rowHeights=20)
+    table.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 10),
+        ("LEFTPADDING", (0, 0), (-1, -1), 15),
+    ]))
+    _, table_height = table.wrapOn(c, width - 90, height)
+    table.drawOn(c, 45, y - table_height + 15)
+    y -= table_height
 
     # Interpret risk for display
-    risk_text, color = interpret_risk(report["risk"])
-
-    # Display risk level
-    y -= 10
-    c.setFillColor(color)
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, f"Risk Level: {risk_text}")
-    c.setFillColor(black)
-
-    # Display risk percentage and recommendation
-    y -= 20
-    c.setFont("Helvetica", 11)
-    c.drawString(50, y, f"Predicted Risk: {report['risk']}%")
-    y -= 15
-    c.drawString(50, y, f"Doctor Recommendation: {doctor_recommendation(report['risk'])}")
+    risk_text, color_name = interpret_risk(report["risk"])
+
+    # Risk summary block: a single text object batches all three
+    # lines into one drawText call
+    summary = c.beginText(50, y - 10)
+    summary.setFillColor(getattr(colors, color_name))
+    summary.setFont("Helvetica-Bold", 12)
+    summary.textLine(f"Risk Level: {risk_text}")
+    summary.setFillColor(colors.black)
+    summary.setFont("Helvetica", 11)
+    summary.textLine(f"Predicted Risk: {report['risk']}%")
+    summary.textLine(f"Doctor Recommendation: {doctor_recommendation(report['risk'])}")
+    c.drawText(summary)
 
     # Footer information
     c.setFont("Helvetica", 9)
@@ -174,32 +180,125 @@ def generate_pdf(report):
     return buffer
 
 
+# Encoded value -> display label mappings, built once at module
+# scope; selectboxes carry the integer codes directly and only format
+# them for display, so no decoding happens on submit
+SEX_OPTIONS = {0: "Female", 1: "Male"}
+YES_NO_OPTIONS = {0: "No", 1: "Yes"}
+CP_OPTIONS = {
+    0: "0 = Typical Angina",
+    1: "1 = Atypical Angina",
+    2: "2 = Non-anginal Pain",
+    3: "3 = Asymptomatic"
+}
+RESTECG_OPTIONS = {
+    0: "0 = Normal",
+    1: "1 = ST-T Abnormality",
+    2: "2 = LV Hypertrophy"
+}
+SLOPE_OPTIONS = {
+    0: "0 = Upsloping",
+    1: "1 = Flat",
+    2: "2 = Downsloping"
+}
+THAL_OPTIONS = {
+    0: "0 = Normal",
+    1: "1 = Fixed Defect",
+    2: "2 = Reversible Defect",
+    3: "3 = Unknown"
+}
+
+
+# Cache key identifying a single report
+def report_key(report):
+    return (report["patient_name"], report["timestamp"], report["risk"])
+
+
+# Returns the PDF bytes for a report, generating each unique report at
+# most once per session and caching the result in session state
+def get_pdf(report):
+    cache = st.session_state.setdefault("pdf_cache", {})
+    key = report_key(report)
+    if key not in cache:
+        cache[key] = generate_pdf(report).getvalue()
+    return cache[key]
+
+
+# Pre-generates PDFs for any reports missing from the session cache.
+# Each report is independent, so a batch is rendered in parallel.
+def warm_pdf_cache(reports):
+    cache = st.session_state.setdefault("pdf_cache", {})
+    missing = [r for r in reports if report_key(r) not in cache]
+    if len(missing) > 1:
+        with ThreadPoolExecutor() as pool:
+            for r, buf in zip(missing, pool.map(generate_pdf, missing)):
+                cache[report_key(r)] = buf.getvalue()
+
+    # Evict PDFs whose reports have rotated out of the bounded
+    # history, so the cache stays as bounded as the history itself
+    live = {report_key(r) for r in reports}
+    for key in list(cache):
+        if key not in live:
+            del cache[key]
+
+
 # ============================================================
 # HEADER
 # ============================================================
 
-# Display main title
-st.markdown(
-    "<h1 style='text-align:center;color:#60a5fa;'>🫀 Heart Disease Risk Predictor</h1>",
-    unsafe_allow_html=True
+# Static hero header, built once at module scope and injected with a
+# single call instead of two markdown passes
+HEADER_HTML = (
+    "<h1 style='text-align:center;color:#60a5fa;'>"
+    "🫀 Heart Disease Risk Predictor</h1>"
+    "<p style='text-align:center;'>ML-based clinical decision support system</p>"
 )
 
-# Display subtitle
-st.markdown(
-    "<p style='text-align:center;'>ML-based clinical decision support system</p>",
-    unsafe_allow_html=True
-)
+st.html(HEADER_HTML)
 
 
 # ============================================================
 # LOAD DATA & TRAIN MODEL (CACHED)
 # ============================================================
 
+# Explicit column dtypes let the C parser skip type inference and
+# load the features directly at inference precision
+CSV_DTYPES = {
+    "age": np.float32, "sex": np.float32, "cp": np.float32,
+    "trestbps": np.float32, "chol": np.float32, "fbs": np.float32,
+    "restecg": np.float32, "thalach": np.float32, "exang": np.float32,
+    "oldpeak": np.float32, "slope": np.float32, "ca": np.float32,
+    "thal": np.float32, "target": np.int8
+}
+
+
+# Cache the dataset so the CSV is parsed only once; persisting to
+# disk lets a restarted process skip the parse as well. The mtime
+# argument keys the cache, so edits to the CSV invalidate the
+# persisted entry instead of serving a stale dataframe.
+@st.cache_data(persist="disk")
+def load_data(csv_mtime):
+    return pd.read_csv("heart_disease_data.csv", dtype=CSV_DTYPES)
+
+
 # Cache the training so it runs only once
 @st.cache_resource
 def train_model():
-    # Load dataset from CSV
-    data = pd.read_csv("heart_disease_data.csv")
+    # On-disk artifact cache: a cold start skips the refit entirely
+    # as long as the dataset file has not changed since the artifacts
+    # were written
+    cache_path = "model_cache.joblib"
+    csv_mtime = os.path.getmtime("heart_disease_data.csv")
+    if os.path.exists(cache_path):
+        artifacts = joblib.load(cache_path)
+        if (artifacts.get("csv_mtime") == csv_mtime
+                and artifacts.get("solver") == "liblinear"):
+            return (artifacts["model"], artifacts["w_eff"],
+                    artifacts["b_eff"], artifacts["features"])
+
+    # Load dataset from CSV (served from the data cache after first
+    # run, keyed on the same mtime that guards the model artifacts)
+    data = load_data(csv_mtime)
 
     # Separate features and target column
     X = data.drop("target", axis=1)
@@ -209,15 +308,48 @@ def train_model():
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
 
-    # Train logistic regression model
-    model = LogisticRegression(max_iter=1000)
+    # Train logistic regression model; liblinear converges much
+    # faster than lbfgs on this small dense binary problem
+    model = LogisticRegression(solver="liblinear")
     model.fit(X_scaled, y)
 
-    return model, scaler, X
+    # Fold the scaler into the coefficients so inference is a single
+    # affine map: sigmoid(x @ W_eff + B_eff) on the *raw* inputs
+    # float32 is plenty of precision for a 13-feature logistic score
+    # and halves the bandwidth of the inference dot product
+    w = model.coef_[0].astype(np.float64)
+    w_eff = (w / scaler.scale_).astype(np.float32)
+    b_eff = float(model.intercept_[0] - (scaler.mean_ / scaler.scale_) @ w)
+
+    # Only the column names are needed outside training; returning
+    # them as a plain list keeps the full DataFrame out of the cache
+    features = list(X.columns)
+
+    # Persist the artifacts so the next cold start can skip the fit
+    joblib.dump({
+        "csv_mtime": csv_mtime,
+        "solver": "liblinear",
+        "model": model,
+        "w_eff": w_eff,
+        "b_eff": b_eff,
+        "features": features,
+    }, cache_path)
+
+    return model, w_eff, b_eff, features
 
 
-# Retrieve trained model, scaler, and feature names
-model, scaler, X = train_model()
+# Retrieve trained model, fused inference weights, and feature names
+model, W_eff, B_eff, FEATURES = train_model()
+
+# Reusable buffer for the 13 patient features, filled in place on each
+# submit instead of boxing a fresh Python list into a new array
+input_data = np.empty(13, dtype=np.float32)
+
+
+# Scores raw feature rows through the fused model. Accepts a single
+# 13-element vector or an (n, 13) batch and returns risk percentages.
+def predict_risk(features):
+    return 1.0 / (1.0 + np.exp(-(features @ W_eff + B_eff))) * 100
 
 
 # ============================================================
@@ -300,17 +432,13 @@ with tabs[0]:
         # Age slider
         age = st.slider("Age (age)", 18, 90, 45)
 
-        # Sex selection (encoded later)
-        sex_label = st.selectbox("Sex (sex)", ["Female", "Male"])
-        sex = 0 if sex_label == "Female" else 1
+        # Sex selection (selectbox holds the code, shows the label)
+        sex = st.selectbox("Sex (sex)", list(SEX_OPTIONS),
+                           format_func=SEX_OPTIONS.get)
 
         # Chest pain type selection
-        cp_label = st.selectbox(
-            "Chest Pain Type (cp)",
-            ["0 = Typical Angina", "1 = Atypical Angina",
-             "2 = Non-anginal Pain", "3 = Asymptomatic"]
-        )
-        cp = int(cp_label[0])
+        cp = st.selectbox("Chest Pain Type (cp)", list(CP_OPTIONS),
+                          format_func=CP_OPTIONS.get)
 
         # Blood pressure input
         trestbps = st.slider("Resting Blood Pressure (trestbps)", 80, 200, 120)
@@ -319,43 +447,37 @@ with tabs[0]:
         chol = st.slider("Serum Cholesterol (chol)", 100, 400, 200)
 
         # Fasting blood sugar
-        fbs_label = st.selectbox("Fasting Blood Sugar >120 mg/dL (fbs)", ["No", "Yes"])
-        fbs = 1 if fbs_label == "Yes" else 0
+        fbs = st.selectbox("Fasting Blood Sugar >120 mg/dL (fbs)",
+                           list(YES_NO_OPTIONS),
+                           format_func=YES_NO_OPTIONS.get)
 
         # ECG result
-        restecg_label = st.selectbox(
-            "Resting ECG Result (restecg)",
-            ["0 = Normal", "1 = ST-T Abnormality", "2 = LV Hypertrophy"]
-        )
-        restecg = int(restecg_label[0])
+        restecg = st.selectbox("Resting ECG Result (restecg)",
+                               list(RESTECG_OPTIONS),
+                               format_func=RESTECG_OPTIONS.get)
 
         # Maximum heart rate
         thalach = st.slider("Maximum Heart Rate Achieved (thalach)", 70, 210, 150)
 
         # Exercise induced angina
-        exang_label = st.selectbox("Exercise Induced Angina (exang)", ["No", "Yes"])
-        exang = 1 if exang_label == "Yes" else 0
+        exang = st.selectbox("Exercise Induced Angina (exang)",
+                             list(YES_NO_OPTIONS),
+                             format_func=YES_NO_OPTIONS.get)
 
         # ST depression value
         oldpeak = st.slider("ST Depression (oldpeak)", 0.0, 6.0, 1.0)
 
         # Slope of ST segment
-        slope_label = st.selectbox(
-            "Slope of Peak Exercise ST Segment (slope)",
-            ["0 = Upsloping", "1 = Flat", "2 = Downsloping"]
-        )
-        slope = int(slope_label[0])
+        slope = st.selectbox("Slope of Peak Exercise ST Segment (slope)",
+                             list(SLOPE_OPTIONS),
+                             format_func=SLOPE_OPTIONS.get)
 
         # Number of major vessels
         ca = st.selectbox("Number of Major Vessels (ca)", [0, 1, 2, 3, 4])
 
         # Thalassemia type
-        thal_label = st.selectbox(
-            "Thalassemia (thal)",
-            ["0 = Normal", "1 = Fixed Defect",
-             "2 = Reversible Defect", "3 = Unknown"]
-        )
-        thal = int(thal_label[0])
+        thal = st.selectbox("Thalassemia (thal)", list(THAL_OPTIONS),
+                            format_func=THAL_OPTIONS.get)
 
         # Submit button
         submitted = st.form_submit_button("🩺 Assess Heart Disease Risk")
@@ -363,39 +485,44 @@ with tabs[0]:
     # Run prediction after form submission
     if submitted:
 
-        # Convert inputs to NumPy array
-        input_data = np.array([
+        # Fill the preallocated feature buffer in place
+        input_data[:] = (
             age, sex, cp, trestbps, chol,
             fbs, restecg, thalach, exang,
             oldpeak, slope, ca, thal
-        ]).reshape(1, -1)
+        )
 
-        # Predict probability of heart disease
-        risk_prob = model.predict_proba(
-            scaler.transform(input_data)
-        )[0][1] * 100
+        # Predict probability of heart disease; the scaler is already
+        # folded into the fused model inside predict_risk
+        risk_prob = float(predict_risk(input_data))
 
         # Interpret risk level
         risk_text, _ = interpret_risk(risk_prob)
 
-        # Store report in session state
-        st.session_state.setdefault("report_history", [])
+        # Build the patient details once; the report references this
+        # dict rather than copying widget values a second time
+        patient_data = {
+            "Patient Name": patient_name or "Not Provided",
+            "Age": age,
+            "Sex": SEX_OPTIONS[sex]
+        }
+
+        # Store report in session state; the deque silently drops the
+        # oldest entry once more than 10 reports accumulate
+        st.session_state.setdefault("report_history", deque(maxlen=10))
         st.session_state["report_history"].append({
-            "patient_name": patient_name or "Not Provided",
+            "patient_name": patient_data["Patient Name"],
             "timestamp": datetime.now(),
             "risk": round(risk_prob, 2),
             "risk_text": risk_text,
-            "patient_data": {
-                "Patient Name": patient_name or "Not Provided",
-                "Age": age,
-                "Sex": sex_label
-            }
+            "patient_data": patient_data
         })
 
-        # Display results
-        st.metric("Predicted Risk (%)", f"{risk_prob:.2f}%")
-        st.info(f"Clinical Interpretation: **{risk_text}**")
-        st.warning(doctor_recommendation(risk_prob))
+        # Display results side by side in a single columns row
+        metric_col, interp_col, advice_col = st.columns(3)
+        metric_col.metric("Predicted Risk (%)", f"{risk_prob:.2f}%")
+        interp_col.info(f"Clinical Interpretation: **{risk_text}**")
+        advice_col.warning(doctor_recommendation(risk_prob))
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -415,14 +542,20 @@ with tabs[1]:
     # Check if any reports exist
     if "report_history" in st.session_state:
 
+        # The deque already holds only the last 10; list newest first
+        recent = list(st.session_state["report_history"])[::-1]
+
+        # Render any not-yet-cached PDFs in parallel
+        warm_pdf_cache(recent)
+
         # Show last 10 reports
-        for i, report in enumerate(st.session_state["report_history"][-10:][::-1]):
+        for i, report in enumerate(recent):
 
             # Expandable section per report
             with st.expander(report["patient_name"]):
 
-                # Generate PDF
-                pdf = generate_pdf(report)
+                # Fetch PDF from the session cache (generated once)
+                pdf = get_pdf(report)
 
                 # Download button
                 st.download_button(
@@ -448,15 +581,19 @@ with tabs[2]:
     # Styled container
     st.markdown("<div class='glass'>", unsafe_allow_html=True)
 
-    # Compute feature importance from model coefficients
-    importance = pd.Series(model.coef_[0], index=X.columns).sort_values()
-
-    # Plot horizontal bar chart
-    fig, ax = plt.subplots()
-    importance.plot(kind="barh", ax=ax)
+    # Sort the coefficients once and cache them; st.bar_chart renders
+    # natively in the browser with no matplotlib import or PNG step
+    @st.cache_data
+    def feature_importance():
+        coefs = model.coef_[0]
+        order = np.argsort(coefs)
+        return pd.DataFrame(
+            {"importance": coefs[order]},
+            index=[FEATURES[i] for i in order]
+        )
 
-    # Display plot
-    st.pyplot(fig)
+    # Display horizontal bar chart
+    st.bar_chart(feature_importance(), horizontal=True)
 
     st.markdown("</div>", unsafe_allow_html=True)
 